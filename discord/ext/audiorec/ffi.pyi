@@ -1,5 +1,5 @@
 import asyncio
-from typing import Callable, Dict
+from typing import Any, Callable, Dict
 
 class MissingFieldError(Exception):
     pass
@@ -42,7 +42,10 @@ class VoiceConnection:
 
     async def stop_record(self, loop_: asyncio.AbstractEventLoop) -> bytes: ...
 
-    def get_state(self) -> Dict: ...
+    async def stop_record_into(self, loop_: asyncio.AbstractEventLoop, buf: bytearray) -> int: ...
+
+    # Refreshes and returns the same dict on every call.
+    def get_state(self) -> Dict[str, Any]: ...
 
     @property
     def latency(self) -> float: ...
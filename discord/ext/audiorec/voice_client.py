@@ -1,8 +1,10 @@
 import os
 import asyncio
+import warnings
 import discord
 import logging
-from typing import Callable, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from discord.voice_client import VoiceProtocol
 from discord.client import Client
@@ -19,6 +21,8 @@ else:
 
 log = logging.getLogger(__name__)
 
+_EMPTY_STATE: Mapping[str, Any] = MappingProxyType({})
+
 
 class NativeVoiceClient(VoiceProtocol):
     """Represent a Discord voice connection
@@ -58,16 +62,30 @@ class NativeVoiceClient(VoiceProtocol):
 
     """
 
+    # The bot's user ID never changes, so its string form is shared by
+    # every voice client instead of being rebuilt per connection.
+    _cached_user_for: Optional[int] = None
+    _cached_user_id: Optional[str] = None
+
     def __init__(self, client: Client, channel: VoiceChannel) -> None:
         super().__init__(client, channel)
         self._connector = VoiceConnector()
-        self._connector.user_id = str(client.user.id)
+        self._connector.user_id = self._user_id_str(client.user.id)
         self._connection: Optional[VoiceConnection] = None
+        self._state_view: Mapping[str, Any] = _EMPTY_STATE
         self._guild = channel.guild
         self._attempts = 0
         self._runner: Optional[asyncio.Task] = None
-        self._voice_state_received = asyncio.Event()
-        self._voice_server_received = asyncio.Event()
+        self._handshake_future: Optional[asyncio.Future] = None
+        self._got_state = False
+        self._got_server = False
+
+    @classmethod
+    def _user_id_str(cls, user_id: int) -> str:
+        if cls._cached_user_for != user_id or cls._cached_user_id is None:
+            cls._cached_user_id = str(user_id)
+            cls._cached_user_for = user_id
+        return cls._cached_user_id
 
     async def on_voice_state_update(self, data: dict) -> None:
         session_id = data['session_id']
@@ -80,10 +98,11 @@ class NativeVoiceClient(VoiceProtocol):
             else:
                 self.channel = self._guild.get_channel(int(channel_id))
         else:
-            self._voice_state_received.set()
+            self._got_state = True
+            self._check_handshake()
 
     async def on_voice_server_update(self, data: dict) -> None:
-        if self._voice_server_received.is_set():
+        if self._got_server:
             log.info('Ignore extraneous voice server update')
             return
         server_id = data['guild_id']
@@ -98,27 +117,38 @@ class NativeVoiceClient(VoiceProtocol):
         if endpoint.startswith('wss://'):
             endpoint = endpoint[6:]
         self._connector.update_connection_config(token, server_id, endpoint)
-        self._voice_server_received.set()
-
-    async def connect(self, *, reconnect: bool, timeout: float) -> None:
+        self._got_server = True
+        self._check_handshake()
+
+    def _check_handshake(self) -> None:
+        future = self._handshake_future
+        if self._got_state and self._got_server and future is not None and not future.done():
+            future.set_result(None)
+
+    async def connect(
+        self,
+        *,
+        reconnect: bool,
+        timeout: float,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
         log.info('Connecting to voice channel')
-        self._voice_server_received.clear()
-        self._voice_state_received.clear()
-        futures = [
-            self._voice_server_received.wait(),
-            self._voice_state_received.wait()
-        ]
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        self._got_state = self._got_server = False
+        self._handshake_future = handshake = loop.create_future()
         await self.voice_connect()
 
         try:
-            await discord.utils.sane_wait_for(futures, timeout=timeout)
+            await asyncio.wait_for(handshake, timeout)
         except asyncio.TimeoutError:
             await self.disconnect(force=True)
             raise
-        self._voice_server_received.clear()
-        self._voice_state_received.clear()
-        loop = asyncio.get_running_loop()
+        finally:
+            self._handshake_future = None
+        self._got_state = self._got_server = False
         self._connection = await self._connector.connect(loop)
+        self._state_view = MappingProxyType(self._connection.get_state())
         if self._runner is not None:
             self._runner.cancel()
 
@@ -129,6 +159,7 @@ class NativeVoiceClient(VoiceProtocol):
             if self._connection is not None:
                 self._connection.disconnect()
                 self._connection = None
+                self._state_view = _EMPTY_STATE
             await self.voice_disconnect()
         finally:
             self.cleanup()
@@ -141,7 +172,8 @@ class NativeVoiceClient(VoiceProtocol):
         await self._guild.change_voice_state(channel=self.channel)
 
     async def voice_disconnect(self):
-        log.info('The voice handshake is being terminated for Channel ID %s (Guild ID %s)', self.channel.id, self._guild.id)
+        if log.isEnabledFor(logging.INFO):
+            log.info('The voice handshake is being terminated for Channel ID %s (Guild ID %s)', self.channel.id, self._guild.id)
         await self._guild.change_voice_state(channel=None)
 
     def play(self, input: str, *, after: Callable[[Exception], None] = lambda x: None) -> None:
@@ -161,25 +193,25 @@ class NativeVoiceClient(VoiceProtocol):
 
 
         """
-        if self._connection:
-            self._connection.play(input, after)
+        conn = self._connection
+        if conn is not None:
+            conn.play(input, after)
     
     def stop(self):
         """Stops playing audio."""
-        if self._connection:
-            self._connection.stop()
+        conn = self._connection
+        if conn is not None:
+            conn.stop()
 
     def is_playing(self) -> bool:
         """Indicates if we're currently playing audio."""
-        if self._connection:
-            return self._connection.is_playing()
-        return False
+        conn = self._connection
+        return conn.is_playing() if conn is not None else False
 
     def is_recording(self) -> bool:
         """Indicates if we're currently recording voice."""
-        if self._connection:
-            return self._connection.is_recording()
-        return False
+        conn = self._connection
+        return conn.is_recording() if conn is not None else False
 
     def record(self, after: Callable[[Exception], None]) -> None:
         """Record discord voice stream
@@ -195,8 +227,9 @@ class NativeVoiceClient(VoiceProtocol):
             denotes an optional exception that was raised during recording.
 
         """
-        if self._connection:
-            return self._connection.record(after)
+        conn = self._connection
+        if conn is not None:
+            return conn.record(after)
 
     async def stop_record(self, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[bytes]:
         """|coro|
@@ -216,7 +249,7 @@ class NativeVoiceClient(VoiceProtocol):
         Parameters
         -----------
         loop: :class:`asyncio.AbstractEventLoop`
-            The event loop that the voice client is running on.
+            Deprecated and ignored. The running event loop is always used.
 
         Returns
         --------
@@ -251,16 +284,65 @@ class NativeVoiceClient(VoiceProtocol):
                         await ctx.send(file=wav_file)  
             
         """
-        if self._connection:
-            if loop is None:
-                loop = asyncio.get_event_loop()
-            return await self._connection.stop_record(loop)
+        if loop is not None:
+            warnings.warn(
+                'The loop parameter of stop_record is deprecated and ignored',
+                DeprecationWarning,
+                stacklevel=2
+            )
+        conn = self._connection
+        if conn is not None:
+            return await conn.stop_record(asyncio.get_running_loop())
         return None
 
-    def get_state(self) -> Dict:
-        if self._connection:
-            return self._connection.get_state()
-        return {}
+    async def stop_record_into(self, buf: bytearray) -> int:
+        """|coro|
+
+        Stop recording and write the audio data into ``buf``.
+
+        This behaves like :meth:`stop_record`, but the WAV data is copied
+        into a caller-owned :class:`bytearray` instead of a new
+        :class:`bytes` object. The data is still copied once, exactly as in
+        :meth:`stop_record`; the only gain is that the same buffer can be
+        reused across recordings. ``buf`` is resized to fit the recorded
+        data, which may reallocate it if the take is larger than before.
+
+        Parameters
+        -----------
+        buf: :class:`bytearray`
+            The buffer that receives the audio data.
+            It must not be exported (e.g. held by a :class:`memoryview`)
+            while recording is being stopped.
+
+        Returns
+        --------
+        The number of bytes written: :class:`int`
+        """
+        conn = self._connection
+        if conn is not None:
+            return await conn.stop_record_into(asyncio.get_running_loop(), buf)
+        del buf[:]
+        return 0
+
+    def get_state(self) -> Mapping[str, Any]:
+        """Returns a read-only view of the voice connection state.
+
+        Warnings
+        ---------
+        The same mapping is refreshed in place and returned on every call,
+        so its values change under the caller. It cannot be modified or
+        serialized with :func:`json.dumps` directly; use
+        ``dict(vc.get_state())`` to take a snapshot.
+
+        Returns
+        --------
+        Connection state: Mapping[:class:`str`, Any]
+        """
+        conn = self._connection
+        if conn is None:
+            return _EMPTY_STATE
+        conn.get_state()
+        return self._state_view
 
     async def reconnect_handler(self, reconnect, timeout):
         backoff = ExponentialBackoff()
@@ -269,11 +351,7 @@ class NativeVoiceClient(VoiceProtocol):
         while True:
             try:
                 await self._connection.run(loop)
-            except ffi.GatewayError as e:
-                log.info('Voice connection got a clean close %s', e)
-                await self.disconnect()
-                return
-            except (ffi.TryReconnect) as e:
+            except ffi.TryReconnect:
                 if not reconnect:
                     await self.disconnect()
                     raise
@@ -284,10 +362,14 @@ class NativeVoiceClient(VoiceProtocol):
                 await asyncio.sleep(retry)
                 await self.voice_disconnect()
                 try:
-                    await self.connect(reconnect=True, timeout=timeout)
+                    await self.connect(reconnect=True, timeout=timeout, loop=loop)
                 except asyncio.TimeoutError:
                     log.warning('Could not connect to voice... Retrying...')
                     continue
+            except ffi.GatewayError as e:
+                log.info('Voice connection got a clean close %s', e)
+                await self.disconnect()
+                return
             else:
                 await self.disconnect()
                 return
@@ -310,10 +392,12 @@ class NativeVoiceClient(VoiceProtocol):
         This could be referred to as the Discord Voice WebSocket latency and is
         an analogue of user's voice latencies as seen in the Discord client.
         """
-        return self._connection.latency if self._connection else float('inf')
+        conn = self._connection
+        return conn.latency if conn is not None else float('inf')
 
     @property
     def average_latency(self) -> float:
         """:class:`float`: Average of most recent 20 HEARTBEAT latencies in seconds.
         """
-        return self._connection.average_latency if self._connection else float('inf')
+        conn = self._connection
+        return conn.average_latency if conn is not None else float('inf')
@@ -22,8 +22,7 @@ project = 'discord-ext-audiorec'
 copyright = '2021, Tomoya Ishii'
 author = 'Tomoya Ishii'
 
-# The full version, including alpha/beta/rc tags
-release = '0.1.3'
+# The full version is read from discord/ext/audiorec/__init__.py below.
 
 
 # -- General configuration ---------------------------------------------------
@@ -86,12 +85,13 @@ source_suffix = '.rst'
 todo_include_todos = True
 
 
+VERSION_RE = re.compile(
+    r'VersionInfo\(major=(\d+)?,\s*?minor=(\d+)?,\s*?micro=(\d+)?, .*',
+    re.MULTILINE
+)
+
 with open('../discord/ext/audiorec/__init__.py') as f:
-    VERSION_MATCH = re.search(
-        r'VersionInfo\(major=(\d+)?,\s*?minor=(\d+)?,\s*?micro=(\d+)?, .*',
-        f.read(),
-        re.MULTILINE
-    )
+    VERSION_MATCH = VERSION_RE.search(f.read())
 if not VERSION_MATCH:
     raise RuntimeError('VersionInfo not found')
 
@@ -8,6 +8,15 @@ import logging
 from discord.ext import commands
 from discord.ext.audiorec import NativeVoiceClient
 
+try:
+    # uvloop's libuv-backed event loop cuts the per-iteration overhead of
+    # the default selector loop, which the voice client relies on heavily.
+    import uvloop
+except ImportError:
+    pass
+else:
+    uvloop.install()
+
 logging.basicConfig(level=logging.INFO)
 
 class Recorder(commands.Cog):
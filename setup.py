@@ -14,12 +14,13 @@ if not IS_READTHEDOCS:
 CURDIR = Path(os.path.dirname(__file__))
 PROJECT_ROOT = CURDIR / 'discord' / 'ext' / 'audiorec'
 
+VERSION_RE = re.compile(
+    r'VersionInfo\(major\s*?=\s*?(\d+)?,\s*?minor\s*?=\s*?(\d+)?,\s*?micro\s*?=\s*?(\d+)?,.*?\)',
+    re.MULTILINE
+)
+
 with open(PROJECT_ROOT / '__init__.py', encoding='utf-8') as f:
-    VERSION_MATCH = re.search(
-        r'VersionInfo\(major\s*?=\s*?(\d+)?,\s*?minor\s*?=\s*?(\d+)?,\s*?micro\s*?=\s*?(\d+)?,.*?\)',
-        f.read(),
-        re.MULTILINE
-    )
+    VERSION_MATCH = VERSION_RE.search(f.read())
 
 if not VERSION_MATCH:
     raise RuntimeError('VersionInfo not found')
@@ -3,14 +3,14 @@ use std::{sync::Arc, thread};
 use parking_lot::Mutex;
 use pyo3::{
     prelude::*,
-    types::{PyBytes, PyDict, PyTuple},
+    types::{PyByteArray, PyBytes, PyDict, PyTuple},
 };
 
 use crate::{
-    error::DiscordError,
+    error::{DiscordError, Result},
     futures,
     payload::SpeakingType,
-    player::{AudioPlayer, FFmpegAudio},
+    player::{AudioInput, AudioPlayer, FFmpegAudio},
     recorder::{AudioDecoder, AudioRecorder, SsrcPacketQueue},
     state::ConnectionState,
     ws::{VoiceGateway, VoiceGatewayBuilder},
@@ -22,6 +22,7 @@ pub(crate) struct VoiceConnection {
     queue: Arc<Mutex<SsrcPacketQueue>>,
     player: Option<AudioPlayer>,
     recorder: Arc<Mutex<Option<AudioRecorder>>>,
+    state: Py<PyDict>,
 }
 
 #[pymethods]
@@ -39,34 +40,38 @@ impl VoiceConnection {
                 let mut lock = gateway.lock();
                 lock.poll()
             };
+            // Only take the GIL here once there is an outcome to hand back to
+            // the event loop. Log records emitted by poll() still take it
+            // briefly through pyo3-log.
+            let e = match result {
+                Ok(()) => continue,
+                Err(e) => e,
+            };
             let gil = Python::acquire_gil();
             let py = gil.python();
             if let Err(e) = py.check_signals() {
                 error!("Python Signal Error: {}", e);
                 let _ = futures::set_exception(py, loop_, ftr, e);
                 break;
-            } else if let Err(e) = result {
-                match e {
-                    DiscordError::ConnectionClosed(code)
-                        if code != 1000 && code != 4014 && code != 4015 =>
-                    {
-                        let _ = futures::set_result(py, loop_, ftr, py.None());
-                        break;
-                    }
-                    _ => {
-                        let _ = futures::set_exception(py, loop_, ftr, e.into());
-                        break;
-                    }
+            }
+            match e {
+                DiscordError::ConnectionClosed(code)
+                    if code != 1000 && code != 4014 && code != 4015 =>
+                {
+                    let _ = futures::set_result(py, loop_, ftr, py.None());
+                }
+                _ => {
+                    let _ = futures::set_exception(py, loop_, ftr, e.into());
                 }
             }
+            break;
         });
 
         Ok(res)
     }
 
-    fn disconnect(&mut self) -> PyResult<()> {
-        let mut lock = self.gateway.lock();
-        lock.close(1000)?;
+    fn disconnect(&mut self, py: Python) -> PyResult<()> {
+        self.with_gateway(py, |gateway| gateway.close(1000))?;
         Ok(())
     }
 
@@ -96,57 +101,151 @@ impl VoiceConnection {
         }
     }
 
-    fn is_recording(&self) -> bool {
-        if let Some(recoder) = &*self.recorder.lock() {
-            recoder.is_recording()
-        } else {
-            false
-        }
+    fn is_recording(&self, py: Python) -> bool {
+        let recorder = Arc::clone(&self.recorder);
+        py.allow_threads(move || {
+            let lock = recorder.lock();
+            lock.as_ref().map_or(false, |recorder| recorder.is_recording())
+        })
     }
 
-    fn send_playing(&self) -> PyResult<()> {
-        let mut lock = self.gateway.lock();
-        lock.speaking(SpeakingType::MICROPHONE)?;
+    fn send_playing(&self, py: Python) -> PyResult<()> {
+        self.with_gateway(py, |gateway| gateway.speaking(SpeakingType::MICROPHONE))?;
         Ok(())
     }
 
-    fn play(&mut self, input: String, after: PyObject) -> PyResult<()> {
+    fn play(&mut self, py: Python, input: String, after: PyObject) -> PyResult<()> {
         if let Some(player) = &self.player {
             player.stop();
         }
 
-        let source = Box::new(FFmpegAudio::new(&input)?);
-        let player = AudioPlayer::new(
-            move |err| {
-                let gil = Python::acquire_gil();
-                let py = gil.python();
-                let _ = after.call1(py, PyTuple::new(py, [err].iter()));
-            },
-            Arc::clone(&self.gateway),
-            Arc::new(Mutex::new(source)),
-        );
+        let source: Box<dyn AudioInput> = Box::new(FFmpegAudio::new(&input)?);
+        let gateway = Arc::clone(&self.gateway);
+        let player = py.allow_threads(move || {
+            AudioPlayer::new(
+                move |err| {
+                    let gil = Python::acquire_gil();
+                    let py = gil.python();
+                    let _ = after.call1(py, PyTuple::new(py, [err].iter()));
+                },
+                gateway,
+                Arc::new(Mutex::new(source)),
+            )
+        });
         self.player = Some(player);
         Ok(())
     }
 
-    fn record(&mut self, after: PyObject) {
-        if let Some(recorder) = &*self.recorder.lock() {
-            recorder.stop();
-        }
-        self.queue = Arc::new(Mutex::new(SsrcPacketQueue::new()));
-        let recorder = AudioRecorder::new(
-            move |err| {
-                let gil = Python::acquire_gil();
-                let py = gil.python();
-                let _ = after.call1(py, PyTuple::new(py, [err].iter()));
-            },
-            Arc::clone(&self.gateway),
-            Arc::clone(&self.queue),
-        );
+    fn record(&mut self, py: Python, after: PyObject) {
+        let previous = Arc::clone(&self.recorder);
+        let gateway = Arc::clone(&self.gateway);
+        let queue = Arc::new(Mutex::new(SsrcPacketQueue::new()));
+        let recorder = {
+            let queue = Arc::clone(&queue);
+            py.allow_threads(move || {
+                if let Some(recorder) = &*previous.lock() {
+                    recorder.stop();
+                }
+                AudioRecorder::new(
+                    move |err| {
+                        let gil = Python::acquire_gil();
+                        let py = gil.python();
+                        let _ = after.call1(py, PyTuple::new(py, [err].iter()));
+                    },
+                    gateway,
+                    queue,
+                )
+            })
+        };
+        self.queue = queue;
         self.recorder = Arc::new(Mutex::new(Some(recorder)));
     }
 
     fn stop_record(&mut self, py: Python, loop_: PyObject) -> PyResult<PyObject> {
+        self.spawn_finish_record(py, loop_, |py, data| {
+            Ok(PyBytes::new(py, &data).to_object(py))
+        })
+    }
+
+    #[text_signature = "(loop, buf, /)"]
+    fn stop_record_into(
+        &mut self,
+        py: Python,
+        loop_: PyObject,
+        buf: Py<PyByteArray>,
+    ) -> PyResult<PyObject> {
+        self.spawn_finish_record(py, loop_, move |py, data| {
+            let buf = buf.as_ref(py);
+            buf.resize(data.len())?;
+            // Safety: the GIL is held and the bytearray has just been resized
+            // to exactly `data.len()` bytes.
+            unsafe { buf.as_bytes_mut() }.copy_from_slice(&data);
+            Ok(data.len().to_object(py))
+        })
+    }
+
+    /// Refreshes and returns the same dict on every call.
+    fn get_state<'py>(&self, py: Python<'py>) -> PyResult<&'py PyDict> {
+        let (secret_key, encryption, endpoint, endpoint_ip, port, token, ssrc, last_heartbeat) =
+            self.with_gateway(py, |gateway| {
+                (
+                    Vec::<u8>::from(gateway.secret_key),
+                    Into::<String>::into(gateway.encryption),
+                    gateway.endpoint.clone(),
+                    gateway.endpoint_ip.clone(),
+                    gateway.port,
+                    gateway.token.clone(),
+                    gateway.ssrc,
+                    gateway.last_heartbeat.elapsed().as_secs_f32(),
+                )
+            });
+        let result = self.state.as_ref(py);
+        result.set_item("secret_key", secret_key)?;
+        result.set_item("encryption_mode", encryption)?;
+        result.set_item("endpoint", endpoint)?;
+        result.set_item("endpoint_ip", endpoint_ip)?;
+        result.set_item("port", port)?;
+        result.set_item("token", token)?;
+        result.set_item("ssrc", ssrc)?;
+        result.set_item("last_heartbeat", last_heartbeat)?;
+        result.set_item("player_connected", self.player.is_some())?;
+        Ok(result)
+    }
+
+    fn latency(&self, py: Python) -> f64 {
+        self.with_gateway(py, |gateway| gateway.latency())
+    }
+
+    fn average_latency(&self, py: Python) -> f64 {
+        self.with_gateway(py, |gateway| gateway.average_latency())
+    }
+}
+
+impl VoiceConnection {
+    /// Runs `f` on the locked gateway with the GIL released.
+    ///
+    /// Background threads log through pyo3-log, which takes the GIL, while
+    /// holding the gateway lock, so waiting for that lock with the GIL held
+    /// could deadlock. Every lock taken from a Python call goes through
+    /// `allow_threads` for the same reason.
+    fn with_gateway<T, F>(&self, py: Python, f: F) -> T
+    where
+        T: Send,
+        F: FnOnce(&mut VoiceGateway) -> T + Send,
+    {
+        let gateway = Arc::clone(&self.gateway);
+        py.allow_threads(move || {
+            let mut lock = gateway.lock();
+            f(&mut lock)
+        })
+    }
+
+    /// Stops recording on a worker thread and resolves the returned future
+    /// with the object `build` makes from the mixed WAV data.
+    fn spawn_finish_record<F>(&self, py: Python, loop_: PyObject, build: F) -> PyResult<PyObject>
+    where
+        F: FnOnce(Python, Vec<u8>) -> PyResult<PyObject> + Send + 'static,
+    {
         let (ftr, res): (PyObject, PyObject) = {
             let ftr = loop_.call_method0(py, "create_future")?;
             (ftr.clone_ref(py), ftr)
@@ -155,74 +254,59 @@ impl VoiceConnection {
         let gateway = Arc::clone(&self.gateway);
         let queue = Arc::clone(&self.queue);
         let recorder = Arc::clone(&self.recorder);
-
-        let state = {
-            let gateway = gateway.lock();
-            Arc::clone(&gateway.state)
-        };
-        state.set_state(ConnectionState::RecordFinished);
+        py.allow_threads(|| set_record_finished(&gateway));
 
         thread::spawn(move || {
+            // Mix the take before taking the GIL so that the event loop
+            // keeps running while the packets are decoded.
+            let result = finish_record(&gateway, &queue, &recorder);
             let gil = Python::acquire_gil();
             let py = gil.python();
             if let Err(e) = py.check_signals() {
                 let _ = futures::set_exception(py, loop_, ftr, e);
                 return;
             }
-            let data = if let Some(recorder) = &*recorder.lock() {
-                recorder.stop();
-                let mut decoder = {
-                    let gateway = gateway.lock();
-                    match AudioDecoder::from_gateway(&*gateway) {
-                        Ok(decoder) => decoder,
-                        Err(e) => {
-                            let _ = futures::set_exception(py, loop_, ftr, PyErr::from(e));
-                            return;
-                        }
-                    }
-                };
-
-                let mut queue = queue.lock();
-                let data = match queue.decode(&mut decoder) {
-                    Ok(data) => data,
-                    Err(e) => {
-                        let _ = futures::set_exception(py, loop_, ftr, PyErr::from(e));
-                        return;
-                    }
-                };
-                data.unwrap_or_default()
-            } else {
-                vec![]
+            let built = match result {
+                Ok(data) => build(py, data),
+                Err(e) => Err(PyErr::from(e)),
             };
-            let _ = futures::set_result(py, loop_, ftr, PyBytes::new(py, &data).to_object(py));
+            match built {
+                Ok(obj) => {
+                    let _ = futures::set_result(py, loop_, ftr, obj);
+                }
+                Err(e) => {
+                    let _ = futures::set_exception(py, loop_, ftr, e);
+                }
+            }
         });
         Ok(res)
     }
+}
 
-    fn get_state<'py>(&self, py: Python<'py>) -> PyResult<&'py PyDict> {
-        let result = PyDict::new(py);
-        let gateway = self.gateway.lock();
-        result.set_item("secret_key", Vec::<u8>::from(gateway.secret_key))?;
-        result.set_item("encryption_mode", Into::<String>::into(gateway.encryption))?;
-        result.set_item("endpoint", gateway.endpoint.clone())?;
-        result.set_item("endpoint_ip", gateway.endpoint_ip.clone())?;
-        result.set_item("port", gateway.port)?;
-        result.set_item("token", gateway.token.clone())?;
-        result.set_item("ssrc", gateway.ssrc)?;
-        result.set_item(
-            "last_heartbeat",
-            gateway.last_heartbeat.elapsed().as_secs_f32(),
-        )?;
-        result.set_item("player_connected", self.player.is_some())?;
-        Ok(result)
-    }
-
-    fn latency(&self) -> f64 {
-        self.gateway.lock().latency()
-    }
+fn set_record_finished(gateway: &Arc<Mutex<VoiceGateway>>) {
+    let state = {
+        let gateway = gateway.lock();
+        Arc::clone(&gateway.state)
+    };
+    state.set_state(ConnectionState::RecordFinished);
+}
 
-    fn average_latency(&self) -> f64 {
-        self.gateway.lock().average_latency()
+/// Stops the recorder and mixes the queued packets into a WAV file.
+fn finish_record(
+    gateway: &Arc<Mutex<VoiceGateway>>,
+    queue: &Arc<Mutex<SsrcPacketQueue>>,
+    recorder: &Arc<Mutex<Option<AudioRecorder>>>,
+) -> Result<Vec<u8>> {
+    if let Some(recorder) = &*recorder.lock() {
+        recorder.stop();
+        let mut decoder = {
+            let gateway = gateway.lock();
+            AudioDecoder::from_gateway(&*gateway)?
+        };
+        let mut queue = queue.lock();
+        Ok(queue.decode(&mut decoder)?.unwrap_or_default())
+    } else {
+        Ok(vec![])
     }
 }
 
@@ -293,6 +377,7 @@ impl VoiceConnector {
                         queue: Arc::new(Mutex::new(SsrcPacketQueue::new())),
                         player: None,
                         recorder: Arc::new(Mutex::new(None)),
+                        state: PyDict::new(py).into(),
                     };
                     let _ = futures::set_result(py, loop_, ftr, obj.into_py(py));
                 }
@@ -90,22 +90,18 @@ impl AudioDecoder {
                             (packet.2 as f64 - timestamp as f64) / SAMPLING_RATE as f64;
                         if elapsed > 0.02 {
                             elapsed = elapsed.min(1.0);
-                            let mut margin = vec![
-                                0.0;
-                                2 * (SAMPLE_SIZE as f64 * (elapsed - 0.02) * SAMPLING_RATE as f64)
-                                    as usize
-                            ];
-                            pcmdata.append(&mut margin);
+                            let margin = 2
+                                * (SAMPLE_SIZE as f64 * (elapsed - 0.02) * SAMPLING_RATE as f64)
+                                    as usize;
+                            pcmdata.resize(pcmdata.len() + margin, 0.0);
                         }
                     }
-                    let mut pcm = self.decode_raw(&packet.0, packet.1);
-                    pcmdata.append(&mut pcm);
+                    self.decode_raw(&packet.0, packet.1, &mut pcmdata);
                     last_timestamp = Some(packet.2)
                 }
                 Dropped => {
                     debug!("Recieve Dropped Packet");
-                    let mut pcm = self.decode_dropped_frame();
-                    pcmdata.append(&mut pcm);
+                    self.decode_dropped_frame(&mut pcmdata);
                     last_timestamp = None;
                     continue;
                 }
@@ -118,26 +114,26 @@ impl AudioDecoder {
         (start_time, pcmdata)
     }
 
-    fn decode_raw(&mut self, data: &[u8], size: usize) -> std::vec::Vec<f32> {
+    /// Decodes a packet and appends the samples to `pcmdata`.
+    fn decode_raw(&mut self, data: &[u8], size: usize, pcmdata: &mut Vec<f32>) {
         debug!("Decoding Packet: SoundData: {:?}", &data[0..size.min(5)]);
         let mut output = [0f32; 1920];
         let size = self
             .opus
             .decode_float(Some(&data[..size]), &mut output[..], false)
             .unwrap_or(0);
-        let mut output = output.to_vec();
-        output.truncate(size * 2);
-        output
+        pcmdata.extend_from_slice(&output[..(size * 2).min(output.len())]);
     }
 
-    fn decode_dropped_frame(&mut self) -> Vec<f32> {
+    /// Conceals a dropped packet and appends the samples to `pcmdata`.
+    fn decode_dropped_frame(&mut self, pcmdata: &mut Vec<f32>) {
         debug!("Decoding Packet: DroppedData");
         let n = self
             .opus
             .last_packet_duration()
             .unwrap_or(SAMPLES_PER_FRAME) as usize;
         if n == 0 {
-            return vec![];
+            return;
         }
         let mut output = [0f32; 1920];
         let size = self
@@ -145,9 +141,7 @@ impl AudioDecoder {
             .decode_float::<&[u8], _>(None, &mut output[..n], false)
             .unwrap_or(0);
         debug!("{}", size);
-        let mut output = output.to_vec();
-        output.truncate(size * 2);
-        output
+        pcmdata.extend_from_slice(&output[..(size * 2).min(output.len())]);
     }
 }
 
@@ -273,8 +267,7 @@ impl SsrcPacketQueue {
                     let (time, packet) = pcm_list.get_mut(i).unwrap();
                     let mut margin =
                         vec![0f32; (SAMPLING_RATE as f64 * 2.0 * (*time - first_time)) as usize];
-                    let mut packet = packet.clone();
-                    margin.append(&mut packet);
+                    margin.append(packet);
                     pcms.push(margin);
                 }
                 let range = pcms.iter().map(|v| v.len()).max().unwrap();